@@ -0,0 +1,414 @@
+"""
+Mode serveur : la simulation tourne sur une machine sans écran et les images
+sont diffusées sur le réseau local à plusieurs spectateurs en même temps.
+
+    python flux_reseau.py serveur --port 8765
+    python flux_reseau.py spectateur 192.168.1.20 --port 8765 --camera principale
+
+Chaque spectateur choisit une caméra par son nom. Tous les spectateurs d'une même
+caméra partagent un seul rendu et un seul encodage ; le cliquer-glisser de n'importe
+lequel d'entre eux fait tourner cette caméra (comme la souris dans main()).
+
+Pipeline :
+    1. Simulation : univers.avancer() à FPS pas par seconde (tâche asyncio), une seule
+       fois par pas quel que soit le nombre de caméras. Le temps simulé suit l'horloge
+       même si le rendu prend du retard.
+    2. Rendu : dessin hors écran pour chaque caméra qui a au moins un spectateur, dans
+       un thread dédié pour que la boucle réseau reste réactive.
+    3. Encodage : XOR avec la frame précédente puis compression zlib en un seul flux.
+       Les pixels inchangés deviennent des zéros que zlib réduit presque à rien.
+       Fait dans un thread pour ne pas bloquer la boucle réseau.
+
+Protocole (TCP, entiers gros-boutistes) :
+    Spectateur -> Serveur : 1 octet (longueur) + nom de la caméra en UTF-8,
+                            puis des paquets "!hh" (dx, dy) tant que le bouton est enfoncé.
+    Serveur -> Spectateur : "!HH" (largeur, hauteur), puis des images :
+                            "!I" taille du message, "!BI" (type, numéro), puis les données zlib.
+                            Image clé : pixels RGB bruts. Delta : pixels RGB XOR frame précédente.
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import os
+import struct
+import threading
+import time
+import zlib
+
+import pygame
+
+from galactic_kepler_sim import (
+    LARGEUR, HAUTEUR, FPS, COULEUR_ESPACE,
+    INCLINAISON_INITIALE, VITESSE_ROTATION, SENSIBILITE_SOURIS,
+    Univers, dessiner_scene,
+)
+
+PORT_DEFAUT = 8765
+CAMERA_DEFAUT = "principale"
+
+NIVEAU_COMPRESSION = 6   # zlib : 1 = rapide, 9 = compact
+FILE_CLIENT_MAX = 3      # Images en attente avant de considérer un spectateur comme trop lent
+
+IMAGE_CLE = 0            # Image complète (nouveau spectateur ou rattrapage)
+IMAGE_DELTA = 1          # Différence (XOR) avec la frame précédente
+
+ENTETE_ECRAN = struct.Struct("!HH")
+ENTETE_TAILLE = struct.Struct("!I")
+ENTETE_IMAGE = struct.Struct("!BI")
+PAQUET_SOURIS = struct.Struct("!hh")
+
+
+# Pixels bruts d'une surface (tostring est l'ancien nom chez Pygame)
+_vers_octets = getattr(pygame.image, "tobytes", None) or pygame.image.tostring
+
+
+def _xor(a, b):
+    """ XOR octet par octet de deux frames de même taille (fait en C via les grands entiers) """
+    return (int.from_bytes(a, "little") ^ int.from_bytes(b, "little")).to_bytes(len(a), "little")
+
+
+def encoder_image(pixels, precedents, cle, numero):
+    """
+    Encode une frame. Sans image clé, on compresse le XOR avec la frame précédente :
+    seules les zones qui ont changé contiennent autre chose que des zéros.
+    Appelée dans un thread : zlib libère le GIL pendant la compression.
+    """
+    donnees = pixels if cle else _xor(pixels, precedents)
+    corps = ENTETE_IMAGE.pack(IMAGE_CLE if cle else IMAGE_DELTA, numero) + zlib.compress(donnees, NIVEAU_COMPRESSION)
+    return ENTETE_TAILLE.pack(len(corps)) + corps
+
+
+def encoder_frame(pixels, precedents, avec_cle, numero):
+    """
+    Encode une frame pour tous les spectateurs d'une caméra : le delta pour ceux qui
+    sont à jour, et l'image clé seulement si quelqu'un en attend une.
+    Renvoie (delta, image_cle), chacun pouvant être None.
+    """
+    delta = encoder_image(pixels, precedents, False, numero) if precedents is not None else None
+    image_cle = encoder_image(pixels, None, True, numero) if avec_cle else None
+    return delta, image_cle
+
+
+def decoder_image(type_image, donnees, precedents):
+    """ Inverse de encoder_image : renvoie les pixels RGB de la nouvelle frame """
+    pixels = zlib.decompress(donnees)
+    if type_image == IMAGE_DELTA:
+        pixels = _xor(pixels, precedents)
+    return pixels
+
+
+class Spectateur:
+    """ Une connexion côté serveur, avec sa file d'images à envoyer """
+    def __init__(self, writer):
+        self.writer = writer
+        self.file = asyncio.Queue(maxsize=FILE_CLIENT_MAX)
+        # Un delta ne sert à rien si on a raté le précédent : on attend la prochaine image clé
+        self.attend_cle = True
+
+    def proposer(self, delta, image_cle):
+        """ Ajoute à la file l'image qui convient à ce spectateur, sans jamais bloquer le rendu """
+        message = image_cle if self.attend_cle else delta
+        if message is None:
+            # Arrivé pendant l'encodage de cette frame : l'image clé viendra à la suivante
+            return
+        try:
+            self.file.put_nowait(message)
+            self.attend_cle = False
+        except asyncio.QueueFull:
+            # On jette tout ce qui est en retard ; seul ce spectateur repartira sur une image clé
+            while not self.file.empty():
+                self.file.get_nowait()
+            self.attend_cle = True
+
+    async def emettre(self):
+        try:
+            while True:
+                message = await self.file.get()
+                self.writer.write(message)
+                await self.writer.drain()
+        except ConnectionError:
+            # La lecture dans gerer_spectateur verra aussi la coupure et fera le ménage
+            pass
+
+
+class Camera:
+    """ Point de vue partagé par tous les spectateurs qui portent le même nom de caméra """
+    def __init__(self, nom):
+        self.nom = nom
+        self.inclinaison_x = INCLINAISON_INITIALE
+        self.rotation_y = 0.0
+        self.spectateurs = set()
+        self.surface = pygame.Surface((LARGEUR, HAUTEUR))
+
+        # Glissement souris reçu depuis la dernière frame
+        # (écrit par la boucle réseau, lu par le thread de rendu)
+        self.verrou = threading.Lock()
+        self.dx = 0
+        self.dy = 0
+        self.manipulee = False
+
+        # État de l'encodeur (delta par rapport à la frame précédente)
+        self.pixels_precedents = None
+        self.numero = 0
+
+    def recevoir_glissement(self, dx, dy):
+        with self.verrou:
+            self.dx += dx
+            self.dy += dy
+            self.manipulee = True
+
+    def appliquer_entrees(self):
+        """ Même règle que la souris dans main() : on tourne seul si personne ne tient la caméra """
+        with self.verrou:
+            dx, dy, manipulee = self.dx, self.dy, self.manipulee
+            self.dx = self.dy = 0
+            self.manipulee = False
+        if manipulee:
+            self.rotation_y += dx * SENSIBILITE_SOURIS
+            self.inclinaison_x += dy * SENSIBILITE_SOURIS
+        else:
+            self.rotation_y += VITESSE_ROTATION
+
+    def diffuser(self, delta, image_cle):
+        for spectateur in self.spectateurs:
+            spectateur.proposer(delta, image_cle)
+
+
+class ServeurFlux:
+    def __init__(self, fps=FPS):
+        self.fps = fps
+        self.cameras = {}
+        self.univers = Univers()
+        self.police = pygame.font.SysFont("Arial", 14)
+        # Profondeur 1 : le rendu de la frame N+1 se fait pendant l'encodage de la frame N
+        self.file_encodage = asyncio.Queue(maxsize=1)
+        self.arret = threading.Event()
+
+    async def boucle_simulation(self):
+        """ Pas de simulation à cadence fixe, indépendante du coût du rendu """
+        boucle = asyncio.get_running_loop()
+        prochaine = boucle.time()
+        while True:
+            self.univers.avancer()
+            # Si la boucle a pris du retard, les pas suivants s'enchaînent sans attente
+            # pour rattraper : le temps simulé reste lié à l'horloge
+            prochaine += 1 / FPS
+            await asyncio.sleep(max(0, prochaine - boucle.time()))
+
+    def boucle_rendu(self, boucle):
+        """
+        Thread de rendu : dessine chaque caméra regardée puis passe les pixels à l'encodeur.
+        L'univers avance en parallèle dans la boucle asyncio ; au pire une étoile
+        vagabonde est dessinée avec un pas d'avance, ce qui ne se voit pas.
+        """
+        prochaine = time.monotonic()
+        while not self.arret.is_set():
+            for camera in list(self.cameras.values()):
+                if self.arret.is_set():
+                    return
+                if not camera.spectateurs:
+                    continue
+                camera.appliquer_entrees()
+                dessiner_scene(camera.surface, self.univers, camera.inclinaison_x, camera.rotation_y, True, self.police)
+                pixels = _vers_octets(camera.surface, "RGB")
+                if not self._confier_encodeur(boucle, camera, pixels):
+                    return
+
+            prochaine += 1 / self.fps
+            attente = prochaine - time.monotonic()
+            if attente < 0:
+                # Rendu trop lent : on ne cherche pas à rattraper les frames perdues
+                prochaine = time.monotonic()
+            else:
+                self.arret.wait(attente)
+
+    def _confier_encodeur(self, boucle, camera, pixels):
+        """
+        Passe une frame à l'encodeur depuis le thread de rendu. On attend une place dans
+        la file (l'encodeur impose son rythme au rendu) mais on abandonne dès que le
+        serveur s'arrête. Renvoie False si le thread de rendu doit s'arrêter.
+        """
+        depot = self.file_encodage.put((camera, pixels))
+        try:
+            futur = asyncio.run_coroutine_threadsafe(depot, boucle)
+        except RuntimeError:
+            # Boucle déjà fermée : la coroutine ne sera jamais lancée
+            depot.close()
+            return False
+        while True:
+            try:
+                futur.result(timeout=0.1)
+                return True
+            except concurrent.futures.TimeoutError:
+                if self.arret.is_set():
+                    futur.cancel()
+                    return False
+            except concurrent.futures.CancelledError:
+                return False
+
+    async def boucle_encodage(self):
+        boucle = asyncio.get_running_loop()
+        while True:
+            camera, pixels = await self.file_encodage.get()
+            # Image clé uniquement pour les spectateurs qui viennent d'arriver ou qui ont pris du retard
+            avec_cle = any(spectateur.attend_cle for spectateur in camera.spectateurs)
+            camera.numero += 1
+            delta, image_cle = await boucle.run_in_executor(
+                None, encoder_frame, pixels, camera.pixels_precedents, avec_cle, camera.numero)
+            camera.pixels_precedents = pixels
+            camera.diffuser(delta, image_cle)
+
+    async def gerer_spectateur(self, reader, writer):
+        try:
+            longueur = (await reader.readexactly(1))[0]
+            nom = (await reader.readexactly(longueur)).decode("utf-8") or CAMERA_DEFAUT
+        except (asyncio.IncompleteReadError, ConnectionError, UnicodeDecodeError):
+            writer.close()
+            return
+
+        camera = self.cameras.get(nom)
+        if camera is None:
+            camera = self.cameras[nom] = Camera(nom)
+        spectateur = Spectateur(writer)
+        camera.spectateurs.add(spectateur)
+        adresse = writer.get_extra_info("peername")
+        print(f"Spectateur {adresse} -> caméra '{nom}' ({len(camera.spectateurs)} connecté(s))")
+
+        writer.write(ENTETE_ECRAN.pack(LARGEUR, HAUTEUR))
+        emission = asyncio.create_task(spectateur.emettre())
+        try:
+            while True:
+                dx, dy = PAQUET_SOURIS.unpack(await reader.readexactly(PAQUET_SOURIS.size))
+                camera.recevoir_glissement(dx, dy)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            emission.cancel()
+            camera.spectateurs.discard(spectateur)
+            if not camera.spectateurs and self.cameras.get(nom) is camera:
+                del self.cameras[nom]
+            writer.close()
+            print(f"Spectateur {adresse} déconnecté")
+
+    async def lancer(self, hote, port):
+        serveur = await asyncio.start_server(self.gerer_spectateur, hote, port)
+        print(f"Serveur de flux sur {hote}:{port} ({self.fps} FPS)")
+        # Démon par sécurité (second Ctrl+C), mais on le joint normalement dans finally
+        rendu = threading.Thread(target=self.boucle_rendu, args=(asyncio.get_running_loop(),), daemon=True)
+        rendu.start()
+        try:
+            async with serveur:
+                await asyncio.gather(serveur.serve_forever(), self.boucle_simulation(), self.boucle_encodage())
+        finally:
+            # On attend la fin du thread de rendu pendant que la boucle tourne encore,
+            # avant qu'elle soit fermée et que pygame.quit() soit appelé
+            self.arret.set()
+            await asyncio.to_thread(rendu.join)
+
+
+def serveur(hote, port, fps):
+    # Rendu hors écran : pas besoin de fenêtre sur les machines de calcul
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    # Une fenêtre minuscule reste nécessaire pour convert_alpha() (image d'Andromède)
+    pygame.display.set_mode((1, 1))
+
+    async def demarrer():
+        await ServeurFlux(fps).lancer(hote, port)
+
+    try:
+        asyncio.run(demarrer())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        pygame.quit()
+
+
+async def _recevoir_images(reader, image):
+    """ Reconstruit chaque frame reçue et la copie sur l'image affichée """
+    boucle = asyncio.get_running_loop()
+    pixels = None
+    while True:
+        taille, = ENTETE_TAILLE.unpack(await reader.readexactly(ENTETE_TAILLE.size))
+        corps = await reader.readexactly(taille)
+        type_image, _ = ENTETE_IMAGE.unpack_from(corps)
+        pixels = await boucle.run_in_executor(
+            None, decoder_image, type_image, corps[ENTETE_IMAGE.size:], pixels)
+        image.blit(pygame.image.frombuffer(pixels, image.get_size(), "RGB"), (0, 0))
+
+
+async def _spectateur(hote, port, nom_camera):
+    reader, writer = await asyncio.open_connection(hote, port)
+    nom = nom_camera.encode("utf-8")[:255]
+    writer.write(bytes([len(nom)]) + nom)
+    largeur, hauteur = ENTETE_ECRAN.unpack(await reader.readexactly(ENTETE_ECRAN.size))
+
+    ecran = pygame.display.set_mode((largeur, hauteur))
+    pygame.display.set_caption(f"Voie Lactée - {hote}:{port} [{nom_camera}]")
+    image = pygame.Surface((largeur, hauteur))
+    image.fill(COULEUR_ESPACE)
+
+    reception = asyncio.create_task(_recevoir_images(reader, image))
+    try:
+        while not reception.done():
+            if any(evenement.type == pygame.QUIT for evenement in pygame.event.get()):
+                break
+
+            # Cliquer-glisser : on envoie le déplacement au serveur au lieu de tourner localement
+            if pygame.mouse.get_pressed()[0]:
+                mx, my = pygame.mouse.get_rel()
+                writer.write(PAQUET_SOURIS.pack(max(-32768, min(32767, mx)), max(-32768, min(32767, my))))
+            else:
+                pygame.mouse.get_rel() # Pour éviter les sauts
+
+            ecran.blit(image, (0, 0))
+            pygame.display.flip()
+            await asyncio.sleep(1 / FPS)
+    finally:
+        reception.cancel()
+        writer.close()
+
+    if reception.done() and not reception.cancelled() and reception.exception():
+        print(f"Connexion perdue : {reception.exception()}")
+
+
+def spectateur(hote, port, nom_camera):
+    pygame.init()
+    try:
+        asyncio.run(_spectateur(hote, port, nom_camera))
+    except (OSError, asyncio.IncompleteReadError) as e:
+        # OSError couvre aussi hôte inconnu (gaierror) et hôte injoignable
+        print(f"Erreur réseau : {e}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        pygame.quit()
+
+
+def _entier_positif(texte):
+    """ Type argparse : un FPS nul ou négatif bloquerait ou emballerait le rendu """
+    valeur = int(texte)
+    if valeur <= 0:
+        raise argparse.ArgumentTypeError(f"doit être un entier strictement positif (reçu {texte})")
+    return valeur
+
+
+if __name__ == "__main__":
+    parseur = argparse.ArgumentParser(description="Diffusion de la simulation sur le réseau local")
+    modes = parseur.add_subparsers(dest="mode", required=True)
+
+    p_serveur = modes.add_parser("serveur", help="Rendu hors écran et diffusion des images")
+    p_serveur.add_argument("--hote", default="0.0.0.0")
+    p_serveur.add_argument("--port", type=int, default=PORT_DEFAUT)
+    p_serveur.add_argument("--fps", type=_entier_positif, default=FPS)
+
+    p_spectateur = modes.add_parser("spectateur", help="Fenêtre qui affiche le flux d'un serveur")
+    p_spectateur.add_argument("hote")
+    p_spectateur.add_argument("--port", type=int, default=PORT_DEFAUT)
+    p_spectateur.add_argument("--camera", default=CAMERA_DEFAUT)
+
+    args = parseur.parse_args()
+    if args.mode == "serveur":
+        serveur(args.hote, args.port, args.fps)
+    else:
+        spectateur(args.hote, args.port, args.camera)
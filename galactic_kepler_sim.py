@@ -9,6 +9,11 @@ FPS = 60
 NB_ETOILES_GALAXIE = 5000
 NB_ETOILES_FOND = 200
 
+# --- Caméra ---
+INCLINAISON_INITIALE = 0.9   # Angle de vue initial
+VITESSE_ROTATION = 0.002     # Rotation automatique quand personne ne tient la souris
+SENSIBILITE_SOURIS = 0.005   # Radians par pixel de glissement
+
 # --- Paramètres Physiques (Inspiré de Newton/Kepler) ---
 MASSE_TROU_NOIR = 2500       
 RAYON_TROU_NOIR = 15       
@@ -316,6 +321,23 @@ class Etoile:
         self.y_offset = random.gauss(0, self.epaisseur/1.5)
 
 
+    def avancer(self):
+        """
+        Fait avancer la physique d'un pas de temps.
+        Séparé du dessin : une même frame peut être dessinée par plusieurs caméras.
+        """
+        if not self.est_vagabonde:
+            return
+
+        # P(t+1) = P(t) + V => Translation
+        self.x_3d += self.vx
+        self.y_3d += self.vy
+        self.z_3d += self.vz
+        
+        # Reset si trop loin (pour garder l'animation active)
+        if math.sqrt(self.x_3d**2 + self.y_3d**2 + self.z_3d**2) > 800:
+            self.initialiser()
+
     def dessiner(self, surface, centre_x, centre_y, temps, mat_x, mat_y, afficher_texte):
         if not self.est_galaxie:
             # SCINTILLEMENT RÉALISTE (Turbulences atmosphériques)
@@ -348,16 +370,7 @@ class Etoile:
 
         # CAS SPÉCIAL : ÉTOILES VAGABONDES (Mouvement Rectiligne Uniforme)
         if self.est_vagabonde:
-            # P(t+1) = P(t) + V => Translation
-            self.x_3d += self.vx
-            self.y_3d += self.vy
-            self.z_3d += self.vz
-            
-            # Reset si trop loin (pour garder l'animation active)
-            if math.sqrt(self.x_3d**2 + self.y_3d**2 + self.z_3d**2) > 800:
-                self.initialiser()
-                
-            # Les coordonnées sont déjà calculées
+            # Les coordonnées sont déjà calculées par avancer()
             x, y, z = self.x_3d, self.y_3d, self.z_3d
             
         else:
@@ -451,6 +464,157 @@ def dessiner_trou_noir(surface, cx, cy, scale):
     # Horizon des événements (Noir absolu)
     pygame.draw.circle(surface, (0, 0, 0), (int(cx), int(cy)), int(rayon_visuel))
 
+class Univers:
+    """
+    État de la simulation (étoiles, galaxies voisines, temps).
+    Il ne dépend d'aucune caméra : on peut le dessiner sous plusieurs angles à chaque pas.
+    """
+    def __init__(self):
+        # Création des étoiles
+        self.etoiles_fond = [Etoile(est_galaxie=False) for _ in range(NB_ETOILES_FOND)]
+        self.etoiles_galaxie = [Etoile(est_galaxie=True) for _ in range(NB_ETOILES_GALAXIE)]
+        
+        # Ajout des étoiles Vagabondes (Hypervéloces)
+        # Ces étoiles ne suivent pas Kepler, elles sortent du système (Mouvement rectiligne)
+        etoiles_vagabondes = [Etoile(est_galaxie=True, est_vagabonde=True) for _ in range(30)]
+        self.etoiles_galaxie.extend(etoiles_vagabondes)
+        
+        # Ajout manuel du Soleil
+        self.le_soleil = Etoile(est_galaxie=True)
+        self.le_soleil.distance = 350
+        self.le_soleil.angle = 1.1 + 350 * 0.015 
+        self.le_soleil.est_soleil = True
+        self.le_soleil.couleur = (255, 255, 0) # Jaune
+        self.le_soleil.taille = 4.0
+        self.le_soleil.y_offset = 0
+        self.etoiles_galaxie.append(self.le_soleil)
+        
+        # --- CREATION GALAXIES VOISINES ---
+        # Coordonnées (x, y, z) approximatives à l'échelle
+        
+        # 1. Andromède (M31) - Notre voisine géante (Image Réaliste .webp)
+        # Note : Pygame gère le .webp sur les versions récentes
+        andromede = GalaxieVoisine("M31 Andromède", -800, 300, 1500, (200, 200, 255), 30, "spirale", "andromede.webp")
+        
+        # 2. Petit Nuage de Magellan (Procédural - points diffus)
+        # On garde le mode classique qui rend souvent mieux pour les galaxies irrégulières qu'une photo mal détourée
+        smc = GalaxieVoisine("Petit Nuage", 350, -250, 700, (180, 180, 200), 7, "nuage")
+        
+        self.galaxies_voisines = [andromede, smc]
+
+        self.temps_global = 0
+
+    def regenerer(self):
+        """ Régénération procédurale de la galaxie (touche Espace) """
+        self.etoiles_galaxie = [Etoile(est_galaxie=True) for _ in range(NB_ETOILES_GALAXIE)]
+        self.etoiles_galaxie.append(self.le_soleil)
+
+    def avancer(self):
+        """ Un pas de simulation, fait une seule fois par frame quel que soit le nombre de caméras """
+        self.temps_global += 0.005
+        for etoile in self.etoiles_galaxie:
+            etoile.avancer()
+
+def dessiner_scene(surface, univers, inclinaison_x, rotation_y, afficher_legendes, police):
+    """ Dessine l'univers vu par une caméra (inclinaison_x, rotation_y) sur une surface """
+    temps_global = univers.temps_global
+    
+    surface.fill(COULEUR_ESPACE)
+
+    # 1. Dessin du fond scintillant
+    for etoile in univers.etoiles_fond:
+        etoile.dessiner(surface, LARGEUR//2, HAUTEUR//2, temps_global, None, None, False)
+
+    # 2. Préparation du rendu Galaxie + Trou Noir
+    liste_rendu = []
+    centre_x, centre_y = LARGEUR//2, HAUTEUR//2
+    
+    # Création des matrices pour cette frame
+    matrice_x = Matrice3x3.rotation_x(inclinaison_x)
+    matrice_y = Matrice3x3.rotation_y(rotation_y)
+    
+    # --- AJOUT DES VOISINES DANS LA LISTE DE RENDU ---
+    for gal in univers.galaxies_voisines:
+         # On applique les matrices comme pour les étoiles
+        tx, ty, tz = matrice_x.multiplier_vecteur(gal.x, gal.y, gal.z)
+        fx, fy, fz = matrice_y.multiplier_vecteur(tx, ty, tz)
+        
+        # On veut qu'elles restent loin, donc on peut tricher un peu sur la distance
+        # Ou les laisser telles quelles
+        liste_rendu.append((fz, "VOISINE", (gal, fx, fy, fz)))
+
+
+    for etoile in univers.etoiles_galaxie:
+        if etoile.est_vagabonde:
+            x, y, z = etoile.x_3d, etoile.y_3d, etoile.z_3d
+        else:
+            # Simulation position orbitale (Kepler)
+            r = max(10, etoile.distance)
+            
+            # Modèle de "COURBE DE ROTATION PLATE" (Matière Noire)
+            # Au lieu de V ~ 1/sqrt(r), la vitesse plafonne.
+            # v_kepler : Décroissance rapide (Influence Trou Noir)
+            # v_halo : Constante (Influence Matière Noire)
+            v_kepler = math.sqrt(MASSE_TROU_NOIR / r) * 1.5
+            v_halo = 3.0 # Vitesse minimale maintenue par le "halo invisible"
+            
+            # La vraie vitesse est une composition (somme des influences ou max)
+            v = max(v_kepler, v_halo)
+            
+            w = v / r
+            angle = etoile.angle + temps_global * w * 5.0
+            
+            x = math.cos(angle) * etoile.distance
+            z = math.sin(angle) * etoile.distance
+            y = etoile.y_offset
+        
+        # On applique les matrices pour connaître le Z final (profondeur)
+        tx, ty, tz = matrice_x.multiplier_vecteur(x, y, z)
+        fx, fy, fz = matrice_y.multiplier_vecteur(tx, ty, tz)
+        
+        liste_rendu.append((fz, "ETOILE", etoile))
+        
+    liste_rendu.append((0, "TROU_NOIR", None))
+    
+    # Tri en fonction de Z (Algorithme du Peintre)
+    # On dessine du plus loin au plus proche
+    liste_rendu.sort(key=lambda x: x[0], reverse=True)
+    
+    for z_val, type_obj, obj in liste_rendu:
+        if type_obj == "ETOILE":
+            obj.dessiner(surface, centre_x, centre_y, temps_global, matrice_x, matrice_y, afficher_legendes)
+        elif type_obj == "TROU_NOIR":
+            scale_bh = 500 / (600 + 0)
+            dessiner_trou_noir(surface, centre_x, centre_y, scale_bh)
+        elif type_obj == "VOISINE":
+            # Récupération des données pré-calculées
+            galaxie_obj, fx, fy, fz = obj
+            
+            camera_z = 600
+            if camera_z + fz > 0:
+                scale = 500 / (camera_z + fz)
+                ecran_x = centre_x + fx * scale
+                ecran_y = centre_y + fy * scale
+                galaxie_obj.dessiner(surface, ecran_x, ecran_y, scale)
+
+    # 3. Interface Utilisateur (Légende)
+    if afficher_legendes:
+        legende = [
+            ("Trou Noir Supermassif (Sagittarius A*)", (0, 0, 0)),
+            ("Barre Galactique (Vieilles Etoiles)", (255, 200, 100)),
+            ("Bras Spiraux (Formation Stellaire)", (50, 150, 255)),
+            ("Système Solaire", (255, 255, 0))
+        ]
+        y_txt = HAUTEUR - 180
+        for nom, col in legende:
+            if col == (0,0,0): pygame.draw.rect(surface, (255,255,255), (9, y_txt-1, 17, 17), 1)
+            pygame.draw.rect(surface, col, (10, y_txt, 15, 15))
+            txt_surf = police.render(nom, True, (200, 200, 200))
+            surface.blit(txt_surf, (35, y_txt))
+            y_txt += 20
+        
+        surface.blit(police.render("Lentille Gravitationnelle Active", True, (100, 255, 100)), (LARGEUR-250, HAUTEUR-30))
+
 def main():
     pygame.init()
     ecran = pygame.display.set_mode((LARGEUR, HAUTEUR))
@@ -486,43 +650,10 @@ def main():
     except Exception as e:
         print(f"Erreur audio : {e}")
     
-    # Création des étoiles
-    etoiles_fond = [Etoile(est_galaxie=False) for _ in range(NB_ETOILES_FOND)]
-    etoiles_galaxie = [Etoile(est_galaxie=True) for _ in range(NB_ETOILES_GALAXIE)]
-    
-    # Ajout des étoiles Vagabondes (Hypervéloces)
-    # Ces étoiles ne suivent pas Kepler, elles sortent du système (Mouvement rectiligne)
-    etoiles_vagabondes = [Etoile(est_galaxie=True, est_vagabonde=True) for _ in range(30)]
-    etoiles_galaxie.extend(etoiles_vagabondes)
-    
-    # Ajout manuel du Soleil
-    le_soleil = Etoile(est_galaxie=True)
-    le_soleil.distance = 350
-    le_soleil.angle = 1.1 + 350 * 0.015 
-    le_soleil.est_soleil = True
-    le_soleil.couleur = (255, 255, 0) # Jaune
-    le_soleil.taille = 4.0
-    le_soleil.y_offset = 0
-    etoiles_galaxie.append(le_soleil)
-    
-    # --- CREATION GALAXIES VOISINES ---
-    # Coordonnées (x, y, z) approximatives à l'échelle
-    
-    # 1. Andromède (M31) - Notre voisine géante (Image Réaliste .webp)
-    # Note : Pygame gère le .webp sur les versions récentes
-    andromede = GalaxieVoisine("M31 Andromède", -800, 300, 1500, (200, 200, 255), 30, "spirale", "andromede.webp")
-    
-    # 2. Petit Nuage de Magellan (Procédural - points diffus)
-    # On garde le mode classique qui rend souvent mieux pour les galaxies irrégulières qu'une photo mal détourée
-    smc = GalaxieVoisine("Petit Nuage", 350, -250, 700, (180, 180, 200), 7, "nuage")
-    
-    galaxies_voisines = [andromede, smc]
+    univers = Univers()
 
-
-    temps_global = 0
-    inclinaison_x = 0.9 # Angle de vue initial
+    inclinaison_x = INCLINAISON_INITIALE
     rotation_y = 0.0
-    vitesse_rot = 0.002
     afficher_legendes = True
     
     police = pygame.font.SysFont("Arial", 14)
@@ -545,117 +676,22 @@ def main():
             if evenement.type == pygame.KEYDOWN:
                 if evenement.key == pygame.K_SPACE:
                     # Reset
-                    etoiles_galaxie = [Etoile(est_galaxie=True) for _ in range(NB_ETOILES_GALAXIE)]
-                    etoiles_galaxie.append(le_soleil)
+                    univers.regenerer()
                 if evenement.key == pygame.K_l:
                     afficher_legendes = not afficher_legendes
 
         # Gestion Souris (Cliquer-glisser pour bouger la caméra)
         if pygame.mouse.get_pressed()[0]:
             mx, my = pygame.mouse.get_rel()
-            rotation_y += mx * 0.005
-            inclinaison_x += my * 0.005
+            rotation_y += mx * SENSIBILITE_SOURIS
+            inclinaison_x += my * SENSIBILITE_SOURIS
         else:
             pygame.mouse.get_rel() # Pour éviter les sauts
-            rotation_y += vitesse_rot
-
-        temps_global += 0.005
-        
-        ecran.fill(COULEUR_ESPACE)
-
-        # 1. Dessin du fond scintillant
-        for etoile in etoiles_fond:
-            etoile.dessiner(ecran, LARGEUR//2, HAUTEUR//2, temps_global, None, None, False)
+            rotation_y += VITESSE_ROTATION
 
-        # 2. Préparation du rendu Galaxie + Trou Noir
-        liste_rendu = []
-        centre_x, centre_y = LARGEUR//2, HAUTEUR//2
+        univers.avancer()
         
-        # Création des matrices pour cette frame
-        matrice_x = Matrice3x3.rotation_x(inclinaison_x)
-        matrice_y = Matrice3x3.rotation_y(rotation_y)
-        
-        # --- AJOUT DES VOISINES DANS LA LISTE DE RENDU ---
-        for gal in galaxies_voisines:
-             # On applique les matrices comme pour les étoiles
-            tx, ty, tz = matrice_x.multiplier_vecteur(gal.x, gal.y, gal.z)
-            fx, fy, fz = matrice_y.multiplier_vecteur(tx, ty, tz)
-            
-            # On veut qu'elles restent loin, donc on peut tricher un peu sur la distance
-            # Ou les laisser telles quelles
-            liste_rendu.append((fz, "VOISINE", (gal, fx, fy, fz)))
-
-
-        for etoile in etoiles_galaxie:
-            if etoile.est_vagabonde:
-                x, y, z = etoile.x_3d, etoile.y_3d, etoile.z_3d
-            else:
-                # Simulation position orbitale (Kepler)
-                r = max(10, etoile.distance)
-                
-                # Modèle de "COURBE DE ROTATION PLATE" (Matière Noire)
-                # Au lieu de V ~ 1/sqrt(r), la vitesse plafonne.
-                # v_kepler : Décroissance rapide (Influence Trou Noir)
-                # v_halo : Constante (Influence Matière Noire)
-                v_kepler = math.sqrt(MASSE_TROU_NOIR / r) * 1.5
-                v_halo = 3.0 # Vitesse minimale maintenue par le "halo invisible"
-                
-                # La vraie vitesse est une composition (somme des influences ou max)
-                v = max(v_kepler, v_halo)
-                
-                w = v / r
-                angle = etoile.angle + temps_global * w * 5.0
-                
-                x = math.cos(angle) * etoile.distance
-                z = math.sin(angle) * etoile.distance
-                y = etoile.y_offset
-            
-            # On applique les matrices pour connaître le Z final (profondeur)
-            tx, ty, tz = matrice_x.multiplier_vecteur(x, y, z)
-            fx, fy, fz = matrice_y.multiplier_vecteur(tx, ty, tz)
-            
-            liste_rendu.append((fz, "ETOILE", etoile))
-            
-        liste_rendu.append((0, "TROU_NOIR", None))
-        
-        # Tri en fonction de Z (Algorithme du Peintre)
-        # On dessine du plus loin au plus proche
-        liste_rendu.sort(key=lambda x: x[0], reverse=True)
-        
-        for z_val, type_obj, obj in liste_rendu:
-            if type_obj == "ETOILE":
-                obj.dessiner(ecran, centre_x, centre_y, temps_global, matrice_x, matrice_y, afficher_legendes)
-            elif type_obj == "TROU_NOIR":
-                scale_bh = 500 / (600 + 0)
-                dessiner_trou_noir(ecran, centre_x, centre_y, scale_bh)
-            elif type_obj == "VOISINE":
-                # Récupération des données pré-calculées
-                galaxie_obj, fx, fy, fz = obj
-                
-                camera_z = 600
-                if camera_z + fz > 0:
-                    scale = 500 / (camera_z + fz)
-                    ecran_x = centre_x + fx * scale
-                    ecran_y = centre_y + fy * scale
-                    galaxie_obj.dessiner(ecran, ecran_x, ecran_y, scale)
-
-        # 3. Interface Utilisateur (Légende)
-        if afficher_legendes:
-            legende = [
-                ("Trou Noir Supermassif (Sagittarius A*)", (0, 0, 0)),
-                ("Barre Galactique (Vieilles Etoiles)", (255, 200, 100)),
-                ("Bras Spiraux (Formation Stellaire)", (50, 150, 255)),
-                ("Système Solaire", (255, 255, 0))
-            ]
-            y_txt = HAUTEUR - 180
-            for nom, col in legende:
-                if col == (0,0,0): pygame.draw.rect(ecran, (255,255,255), (9, y_txt-1, 17, 17), 1)
-                pygame.draw.rect(ecran, col, (10, y_txt, 15, 15))
-                txt_surf = police.render(nom, True, (200, 200, 200))
-                ecran.blit(txt_surf, (35, y_txt))
-                y_txt += 20
-            
-            ecran.blit(police.render("Lentille Gravitationnelle Active", True, (100, 255, 100)), (LARGEUR-250, HAUTEUR-30))
+        dessiner_scene(ecran, univers, inclinaison_x, rotation_y, afficher_legendes, police)
         
         ecran.blit(police.render("L: Légende | Espace: Reset | Souris: Tourner", True, (150, 150, 150)), (10, 10))
         